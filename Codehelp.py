@@ -1,54 +1,649 @@
 import os
+import shutil
 import sys
+import tempfile
+from array import array
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
 from PySide6.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QFileDialog,
-    QMessageBox, QCheckBox, QScrollArea, QLabel, QMenu, QTabWidget,
-    QGroupBox, QSplitter, QStatusBar, QToolTip, QSizePolicy, QMainWindow
+    QMessageBox, QScrollArea, QLabel, QMenu, QTabWidget,
+    QGroupBox, QSplitter, QStatusBar, QToolTip, QSizePolicy, QMainWindow, QListView, QStyledItemDelegate,
+    QStyle, QStyleOptionButton, QStyleOptionViewItem
+)
+from PySide6.QtCore import (
+    QSettings, Qt, Signal, QTimer, QUrl, QMimeData, QAbstractListModel, QModelIndex, QObject,
+    QRunnable, QThreadPool, QSize, QRect, QEvent, QFileSystemWatcher
 )
-from PySide6.QtCore import QSettings, Qt, Signal, QTimer, QUrl, QMimeData
 from PySide6.QtGui import QFont, QIcon, QShortcut, QKeySequence, QColor, QPalette, QFontMetrics
 
+# File names and directories considered when collecting Python files
+_ALLOWED_EXT = ('.py',)  # A tuple so it can be passed straight to str.endswith
+_EXCLUDED_FILES = frozenset({'__init__.py', 'Codehelp.py', 'analysis_depend.py'})
+_EXCLUDED_DIRS = frozenset({'__pycache__', '.git', '.venv', 'venv', '.idea', '.vscode'})
+
+# Styling for the custom widgets, parsed once for the whole window instead of per instance
+_WINDOW_QSS = """
+    ActionButton {
+        background-color: #f0f4f8;
+        border: 1px solid #c0c0c0;
+        border-radius: 4px;
+        padding: 2px 10px;
+        font-weight: 500;
+        min-height: 22px;
+    }
+    ActionButton:hover {
+        background-color: #e0f0ff;
+        border: 1px solid #a0c0e0;
+    }
+    ActionButton:pressed {
+        background-color: #c0d0e0;
+    }
+    ActionButton:disabled {
+        background-color: #f0f0f0;
+        color: #a0a0a0;
+        border: 1px solid #d0d0d0;
+    }
+    StatusLabel {
+        font-weight: bold;
+        font-size: 14px;
+        padding: 1px;
+        margin: 1px;
+    }
+    StatusLabel[status="success"] {
+        color: #00aa00;
+    }
+    StatusLabel[status="failure"] {
+        color: #cc0000;
+    }
+    StatusLabel[status="warning"] {
+        color: #ee8800;
+    }
+    QLabel#EmptyFilesLabel, QLabel#EmptyTabLabel {
+        color: #888888;
+        font-style: italic;
+    }
+    QLabel#EmptyFilesLabel {
+        padding: 20px;
+    }
+    QLabel#EmptyTabLabel {
+        padding: 8px;
+    }
+"""
+
+
+def _count_lines(path):
+    """Count newlines in a file by scanning raw bytes in large chunks"""
+    n = 0
+    last = b'\n'
+    buf = bytearray(1 << 16)
+    with open(path, 'rb', buffering=0) as f:
+        # readinto reuses one buffer instead of allocating a new bytes object per chunk
+        while (size := f.readinto(buf)):
+            n += buf.count(b'\n', 0, size)
+            last = buf[size - 1:size]
+    # A final line without a trailing newline still counts, as when iterating the file
+    if last != b'\n':
+        n += 1
+    return n
+
+
+def _read_text_or_error(path):
+    """Read a file as UTF-8 text, returning the exception instead if it cannot be read"""
+    try:
+        return path.read_text(encoding="utf-8")
+    except Exception as e:
+        return e
+
+
+def _read_files(paths):
+    """Read files as UTF-8 text in parallel, in order, with exceptions in place of unreadable files"""
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        return list(pool.map(_read_text_or_error, paths))
+
+
+def _first_line(content):
+    """Return the stripped first line of a text without splitting the rest of it"""
+    first_nl = content.find("\n")
+    return (content[:first_nl] if first_nl >= 0 else content).strip()
+
+
+@lru_cache(maxsize=4096)
+def _relative_or_absolute(file_path, script_dir):
+    """Get a relative posix path if possible, otherwise absolute; memoized since rows repeat across refreshes"""
+    try:
+        return file_path.relative_to(script_dir).as_posix()
+    except ValueError:
+        return file_path.as_posix()
+
+
+def _filter_python_posix(posix_paths):
+    """Keep Python files that are not excluded, dropping later files with an already seen name"""
+    kept = []
+    seen_file_names = set()
+    for posix in posix_paths:
+        name = posix.rsplit('/', 1)[-1]
+        if name.endswith(_ALLOWED_EXT) and name not in _EXCLUDED_FILES and name not in seen_file_names:
+            seen_file_names.add(name)
+            kept.append(posix)
+    return kept
+
+
+def _scan_directory(current_dir, script_dir, grouped):
+    """Add the Python files of one directory to grouped and return its subdirectories to scan"""
+    try:
+        with os.scandir(current_dir) as entries:
+            entries = list(entries)
+    except OSError:
+        return []
+
+    # Get directory name for tab organization
+    dir_rel = Path(os.path.relpath(current_dir, script_dir)).as_posix()
+    if dir_rel == ".":
+        dir_rel = "(top-level)"
+
+    subdirs = []
+    for entry in entries:
+        name = entry.name
+
+        # Skip excluded directories
+        if entry.is_dir(follow_symlinks=False):
+            if name not in _EXCLUDED_DIRS:
+                subdirs.append(entry.path)
+            continue
+
+        # Check if it's a Python file and not excluded
+        if name.endswith(_ALLOWED_EXT) and name not in _EXCLUDED_FILES:
+            # Get relative path for display
+            rel = name if dir_rel == "(top-level)" else f"{dir_rel}/{name}"
+            grouped.setdefault(dir_rel, []).append((rel, Path(entry.path).as_posix()))
+
+    return subdirs
+
+
+def _scan_subtree(root, script_dir):
+    """Scan a directory tree for Python files, grouped by directory relative to script_dir"""
+    grouped = {}
+    stack = [root]
+    while stack:
+        stack.extend(_scan_directory(stack.pop(), script_dir, grouped))
+    return grouped
+
+
+def _scan_tree(script_dir):
+    """Scan script_dir for Python files, grouped by directory for the tabs"""
+    # Scan the top level here, then each first-level subtree on its own thread
+    all_files_grouped = {}
+    subdirs = _scan_directory(script_dir, script_dir, all_files_grouped)
+    if subdirs:
+        with ThreadPoolExecutor() as pool:
+            # Subtrees never share a directory, so their groups can be merged directly
+            for grouped in pool.map(_scan_subtree, subdirs, [script_dir] * len(subdirs)):
+                all_files_grouped.update(grouped)
+
+    return all_files_grouped
+
 
-class FileCheckBox(QCheckBox):
-    """Custom QCheckBox that emits a signal when right-clicked"""
-    rightClicked = Signal(object)
+class ScanSignals(QObject):
+    """Signals emitted by ScanWorker"""
+    finished = Signal(object)
+    failed = Signal(object)
+
+
+class ScanWorker(QRunnable):
+    """Scans a directory on a thread pool thread and reports the grouped files"""
 
-    def __init__(self, text, file_path, parent=None):
-        super().__init__(text, parent)
-        self.file_path = Path(file_path)
-        self.setStyleSheet("""
-            QCheckBox {
-                spacing: 4px;
-                margin: 1px;
-                padding: 1px;
-                font-family: Arial;
-            }
-            QCheckBox::indicator {
-                width: 14px;
-                height: 14px;
-                margin: 1px;
-            }
-            QCheckBox:hover {
-                background-color: #e0f0ff;
-                border-radius: 3px;
-            }
-        """)
-        self.setCursor(Qt.PointingHandCursor)
+    def __init__(self, script_dir):
+        super().__init__()
+        self.script_dir = script_dir
+        self.signals = ScanSignals()
+
+    def run(self):
+        try:
+            all_files_grouped = _scan_tree(self.script_dir)
+        except Exception as e:
+            self.signals.failed.emit(e)
+        else:
+            self.signals.finished.emit(all_files_grouped)
+
+
+class FileTaskSignals(QObject):
+    """Signals emitted by FileTask, carrying the task itself along with its outcome"""
+    finished = Signal(object, object)
+    failed = Signal(object, object)
+
+
+class FileTask(QRunnable):
+    """Runs a blocking file operation on a thread pool thread and reports its result or exception"""
+
+    def __init__(self, fn, args, on_finished, on_failed=None):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.on_finished = on_finished
+        self.on_failed = on_failed
+        self.signals = FileTaskSignals()
+
+    def run(self):
+        try:
+            result = self.fn(*self.args)
+        except Exception as e:
+            self.signals.failed.emit(self, e)
+        else:
+            self.signals.finished.emit(self, result)
+
+
+class FileListModel(QAbstractListModel):
+    """Checkable list model for the files of one directory tab"""
+
+    def __init__(self, files, parent=None):
+        super().__init__(parent)
+        self._set_files(files)
+
+    def _set_files(self, files):
+        self.rels = [rel_path for rel_path, _ in files]
+        self.abs = [abs_path for _, abs_path in files]
+        self.checked = bytearray(len(files))
+        self.lines = array('i', [-1] * len(files))  # -1 until the line count is known
+
+    def replace(self, files):
+        """Replace all rows with a new list of (rel_path, abs_path) files"""
+        self.beginResetModel()
+        self._set_files(files)
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.rels)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        row = index.row()
+        if role == Qt.DisplayRole:
+            line_count = self.lines[row]
+            if line_count < 0:
+                return self.rels[row]
+            return f"{self.rels[row]} ({line_count} lines)"
+        if role == Qt.CheckStateRole:
+            return Qt.Checked if self.checked[row] else Qt.Unchecked
+        if role == Qt.ToolTipRole:
+            return self.abs[row]
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsUserCheckable
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or role != Qt.CheckStateRole:
+            return False
+
+        self.checked[index.row()] = Qt.CheckState(value) == Qt.Checked
+        self.dataChanged.emit(index, index, [Qt.CheckStateRole])
+        return True
+
+    def set_all_checked(self, checked):
+        """Check or uncheck every row with a single change notification"""
+        if not self.checked:
+            return
+
+        self.checked[:] = (b'\x01' if checked else b'\x00') * len(self.checked)
+        self.dataChanged.emit(self.index(0), self.index(len(self.checked) - 1), [Qt.CheckStateRole])
+
+    def set_line_count(self, row, line_count):
+        """Store the line count for a row and refresh its text"""
+        self.lines[row] = line_count
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [Qt.DisplayRole])
+
+    def checked_paths(self):
+        """Return the paths of all checked files, in display order"""
+        return [Path(abs_path) for abs_path, checked in zip(self.abs, self.checked) if checked]
+
+
+class FileItemDelegate(QStyledItemDelegate):
+    """Item delegate that reports one precomputed size for every row and toggles a row clicked anywhere"""
+
+    def __init__(self, row_size, parent=None):
+        super().__init__(parent)
+        self.row_size = row_size
+        self._pressed_row = None  # Row under a held mouse button
+
+    def sizeHint(self, option, index):
+        return self.row_size
+
+    def editorEvent(self, event, model, option, index):
+        event_type = event.type()
+        if event_type not in (QEvent.MouseButtonPress, QEvent.MouseButtonRelease, QEvent.MouseButtonDblClick):
+            return super().editorEvent(event, model, option, index)
+        if event.button() != Qt.LeftButton:
+            return False
+
+        # Clicking the file name toggles it as well as the indicator, like a checkbox label;
+        # a click only counts when press and release land on the same row
+        row = index.row()
+        if event_type == QEvent.MouseButtonRelease:
+            pressed_row, self._pressed_row = self._pressed_row, None
+            if pressed_row == row:
+                checked = index.data(Qt.CheckStateRole) == Qt.Checked
+                model.setData(index, Qt.Unchecked if checked else Qt.Checked, Qt.CheckStateRole)
+        else:
+            # The second press of a double click counts as a press, as for QCheckBox
+            self._pressed_row = row
+        return True
+
+
+class SelectedFilesModel(QAbstractListModel):
+    """Checkable list model over the selected files of a CodeCombinerApp"""
+    StatusRole = Qt.UserRole + 1
+    HighlightRole = Qt.UserRole + 2
+
+    def __init__(self, app, parent=None):
+        super().__init__(parent)
+        self._app = app
+        self.posix = []
+        self.texts = []
+        self.statuses = {}  # posix -> {action: status}
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.posix)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        posix = self.posix[index.row()]
+        if role == Qt.DisplayRole:
+            return self.texts[index.row()]
+        if role == Qt.CheckStateRole:
+            return Qt.Checked if posix in self._app.checked_file_paths else Qt.Unchecked
+        if role == Qt.ToolTipRole:
+            return posix
+        if role == self.StatusRole:
+            return self.statuses.get(posix, {})
+        if role == self.HighlightRole:
+            return posix == self._app.highlighted_file
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsUserCheckable
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or role != Qt.CheckStateRole:
+            return False
+
+        file_path = self._app.file_paths[index.row()]
+        if Qt.CheckState(value) == Qt.Checked:
+            self._app.check_file(file_path)
+        else:
+            self._app.uncheck_file(file_path)
+
+        self.dataChanged.emit(index, index, [Qt.CheckStateRole])
+        self._app.update_select_all_state()
+        return True
+
+    def reload(self):
+        """Re-read the app's file list, including the displayed line counts"""
+        self.beginResetModel()
+        self.posix = list(self._app._file_posix)
+        self.texts = [
+            self._app.file_display_text(fp, posix=posix) for fp, posix in zip(self._app.file_paths, self.posix)
+        ]
+        self.endResetModel()
+
+    def refresh_rows(self, first=0, last=None):
+        """Repaint a range of rows, by default all of them"""
+        if last is None:
+            last = len(self.posix) - 1
+        if 0 <= first <= last:
+            self.dataChanged.emit(self.index(first), self.index(last))
+
+    def refresh_file(self, posix):
+        """Repaint the row of a file, if it is still listed"""
+        # The model's rows mirror the app's file list, so its row index applies;
+        # a row that does not match yet is repainted when the model catches up
+        row = self._app._path_index.get(Path(posix))
+        if row is not None and row < len(self.posix) and self.posix[row] == posix:
+            self.refresh_rows(row, row)
+
+    def append_rows(self, file_paths):
+        """Append rows for files just added to the end of the app's list, in one insertion"""
+        if not file_paths:
+            return
+        first = len(self.posix)
+        self.beginInsertRows(QModelIndex(), first, first + len(file_paths) - 1)
+        # The app has already appended the files, along with their posix strings
+        new_posix = self._app._file_posix[first:]
+        self.posix.extend(new_posix)
+        self.texts.extend(self._app.file_display_text(fp, posix=posix) for fp, posix in zip(file_paths, new_posix))
+        self.endInsertRows()
+
+    def remove_row(self, row):
+        """Remove a single row"""
+        self.beginRemoveRows(QModelIndex(), row, row)
+        posix = self.posix.pop(row)
+        del self.texts[row]
+        self.statuses.pop(posix, None)
+        self.endRemoveRows()
+
+    def move_rows_to_head(self, rows):
+        """Move the given ascending rows to the top, keeping their order, one move per contiguous run"""
+        dest = 0
+        i = 0
+        while i < len(rows):
+            first = last = rows[i]
+            while i + 1 < len(rows) and rows[i + 1] == last + 1:
+                i += 1
+                last += 1
+            i += 1
+
+            # Earlier runs were moved above this one, so its row numbers are unchanged
+            if first != dest:
+                self.beginMoveRows(QModelIndex(), first, last, QModelIndex(), dest)
+                for values in (self.posix, self.texts):
+                    values[dest:last + 1] = values[first:last + 1] + values[dest:first]
+                self.endMoveRows()
+            dest += last - first + 1
+
+    def set_text(self, row, text):
+        """Replace the displayed text of a row"""
+        self.texts[row] = text
+        self.refresh_rows(row, row)
+
+    def set_status(self, posix, action, status):
+        """Set or clear (status=None) the status symbol shown next to an action button"""
+        if status is None:
+            row_statuses = self.statuses.get(posix)
+            if row_statuses:
+                row_statuses.pop(action, None)
+                if not row_statuses:
+                    del self.statuses[posix]
+        else:
+            self.statuses.setdefault(posix, {})[action] = status
+        self.refresh_file(posix)
+
+
+class RowStatusIndicator:
+    """Status symbol next to one action button of a selected file row, painted by SelectedFileDelegate"""
+
+    def __init__(self, model, posix, action):
+        self.model = model
+        self.posix = posix
+        self.action = action
+
+    def show_success(self, duration=1500):
+        """Show success checkmark"""
+        self.model.set_status(self.posix, self.action, "success")
+        QTimer.singleShot(duration, self.clear_status)
+
+    def show_failure(self, duration=1500):
+        """Show failure indicator"""
+        self.model.set_status(self.posix, self.action, "failure")
+        QTimer.singleShot(duration, self.clear_status)
+
+    def show_warning(self, duration=1500):
+        """Show warning indicator"""
+        self.model.set_status(self.posix, self.action, "warning")
+        QTimer.singleShot(duration, self.clear_status)
+
+    def clear_status(self):
+        """Clear the status indicator"""
+        self.model.set_status(self.posix, self.action, None)
+
+
+class SelectedFileDelegate(QStyledItemDelegate):
+    """Paints a selected file row with its action buttons and dispatches clicks on them"""
+    ROW_HEIGHT = 24
+    BUTTON_WIDTH = 50
+    STATUS_WIDTH = 24
+    SPACING = 1
+
+    # (action, button text, tooltip, has a status symbol)
+    ACTIONS = (
+        ('copy', "Copy", "Copy the content of {}", True),
+        ('paste', "Paste", "Paste clipboard content to {}", True),
+        ('revert', "Revert", "Revert {} to previous version", True),
+        ('remove', "Remove", "Remove {} from the list", False),
+    )
+
+    BUTTON_LABELS = {action: label for action, label, _, _ in ACTIONS}
+
+    STATUS_SYMBOLS = {
+        'success': ("✓", QColor("#00aa00")),
+        'failure': ("✗", QColor("#cc0000")),
+        'warning': ("!", QColor("#ee8800")),
+    }
 
-    def contextMenuEvent(self, event):
-        menu = QMenu(self)
-        copy_action = menu.addAction("Copy File Content")
-        remove_action = menu.addAction("Remove From List")
+    HIGHLIGHT_COLOR = QColor("#d0e8ff")
+    HOVER_COLOR = QColor("#f8f8f8")
+    SEPARATOR_COLOR = QColor("#e0e0e0")
 
-        action = menu.exec(self.mapToGlobal(event.pos()))
-        if action == copy_action:
-            self.parent().copy_file_code(self.file_path)
-        elif action == remove_action:
-            self.parent().remove_file(self.file_path)
+    def __init__(self, app, parent=None):
+        super().__init__(parent)
+        self._app = app
+        self._status_font = QFont(parent.font() if parent is not None else app.font())
+        self._status_font.setBold(True)
+        self._status_font.setPixelSize(14)
+        self._button_option = QStyleOptionButton()  # Reconfigured for every button painted
+        self._pressed = None  # (row, action) under a held mouse button; action is None on the file name
+
+    def button_layout(self, rect):
+        """Split a row rect into the text rect and (action, button rect, status rect) entries"""
+        entries = []
+        right = rect.right() + 1
+        for action, _, _, has_status in reversed(self.ACTIONS):
+            status_rect = None
+            if has_status:
+                right -= self.STATUS_WIDTH
+                status_rect = QRect(right, rect.top(), self.STATUS_WIDTH, rect.height())
+                right -= self.SPACING
+            right -= self.BUTTON_WIDTH
+            button_rect = QRect(right, rect.top() + 1, self.BUTTON_WIDTH, rect.height() - 2)
+            right -= self.SPACING
+            entries.append((action, button_rect, status_rect))
+
+        entries.reverse()
+        text_rect = QRect(rect.left(), rect.top(), max(0, right - rect.left()), rect.height())
+        return text_rect, entries
+
+    def action_at(self, rect, pos):
+        """Return the action whose button contains pos, or None"""
+        _, entries = self.button_layout(rect)
+        for action, button_rect, _ in entries:
+            if button_rect.contains(pos):
+                return action
+        return None
+
+    def sizeHint(self, option, index):
+        buttons_width = len(self.ACTIONS) * (self.BUTTON_WIDTH + self.SPACING) + 3 * (self.STATUS_WIDTH + self.SPACING)
+        return QSize(buttons_width + 200, self.ROW_HEIGHT)
+
+    def paint(self, painter, option, index):
+        painter.save()
+        if index.data(SelectedFilesModel.HighlightRole):
+            painter.fillRect(option.rect, self.HIGHLIGHT_COLOR)
+        elif option.state & QStyle.State_MouseOver:
+            painter.fillRect(option.rect, self.HOVER_COLOR)
+        painter.setPen(self.SEPARATOR_COLOR)
+        painter.drawLine(option.rect.bottomLeft(), option.rect.bottomRight())
+        painter.restore()
+
+        text_rect, entries = self.button_layout(option.rect)
+
+        # Checkbox and file name
+        text_option = QStyleOptionViewItem(option)
+        text_option.rect = text_rect
+        super().paint(painter, text_option, index)
+
+        # Action buttons and their status symbols
+        style = option.widget.style() if option.widget else QApplication.style()
+        statuses = index.data(SelectedFilesModel.StatusRole)
+        for action, button_rect, status_rect in entries:
+            button = self._button_option
+            button.rect = button_rect
+            button.text = self.BUTTON_LABELS[action]
+            button.state = QStyle.State_Enabled
+            button.state |= QStyle.State_Sunken if self._pressed == (index.row(), action) else QStyle.State_Raised
+            style.drawControl(QStyle.CE_PushButton, button, painter, option.widget)
+
+            status = statuses.get(action)
+            if status_rect is not None and status:
+                symbol, color = self.STATUS_SYMBOLS[status]
+                painter.save()
+                painter.setFont(self._status_font)
+                painter.setPen(color)
+                painter.drawText(status_rect, Qt.AlignCenter, symbol)
+                painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        event_type = event.type()
+        if event_type not in (QEvent.MouseButtonPress, QEvent.MouseButtonRelease, QEvent.MouseButtonDblClick):
+            return super().editorEvent(event, model, option, index)
+        if event.button() != Qt.LeftButton:
+            return False
+
+        row = index.row()
+        action = self.action_at(option.rect, event.position().toPoint())
+
+        # A click only counts when press and release land on the same button, or the same file name
+        if event_type == QEvent.MouseButtonRelease:
+            pressed, self._pressed = self._pressed, None
+            if pressed == (row, action):
+                if action:
+                    # Run after the event is handled; actions may reset the model or open dialogs
+                    file_path = self._app.file_paths[row]
+                    QTimer.singleShot(0, lambda: self._app.run_file_action(action, file_path))
+                else:
+                    # Clicking anywhere on the file name toggles it, like a checkbox label
+                    checked = index.data(Qt.CheckStateRole) == Qt.Checked
+                    model.setData(index, Qt.Unchecked if checked else Qt.Checked, Qt.CheckStateRole)
+        else:
+            # The second press of a double click counts as a press, as for QCheckBox and QPushButton
+            self._pressed = (row, action)
 
-        self.rightClicked.emit(self)
+        if option.widget is not None:
+            option.widget.viewport().update(option.rect)
+        return True
+
+    def helpEvent(self, event, view, option, index):
+        if event.type() == QEvent.ToolTip:
+            action = self.action_at(option.rect, event.pos())
+            if action:
+                tooltip = next(text for name, _, text, _ in self.ACTIONS if name == action)
+                QToolTip.showText(event.globalPos(), tooltip.format(self._app.file_paths[index.row()].name), view)
+                return True
+        return super().helpEvent(event, view, option, index)
 
 
 class ActionButton(QPushButton):
@@ -58,30 +653,6 @@ class ActionButton(QPushButton):
         super().__init__(text, parent)
         self.setCursor(Qt.PointingHandCursor)
 
-        # Apply styling
-        self.setStyleSheet("""
-            QPushButton {
-                background-color: #f0f4f8;
-                border: 1px solid #c0c0c0;
-                border-radius: 4px;
-                padding: 2px 10px;
-                font-weight: 500;
-                min-height: 22px;
-            }
-            QPushButton:hover {
-                background-color: #e0f0ff;
-                border: 1px solid #a0c0e0;
-            }
-            QPushButton:pressed {
-                background-color: #c0d0e0;
-            }
-            QPushButton:disabled {
-                background-color: #f0f0f0;
-                color: #a0a0a0;
-                border: 1px solid #d0d0d0;
-            }
-        """)
-
         if icon:
             self.setIcon(icon)
 
@@ -96,87 +667,96 @@ class StatusLabel(QLabel):
         super().__init__(parent)
         self.setFixedWidth(24)
         self.setAlignment(Qt.AlignCenter)
-        self.setStyleSheet("""
-            QLabel {
-                font-weight: bold;
-                font-size: 14px;
-                padding: 1px;
-                margin: 1px;
-            }
-        """)
+
+    def set_status(self, text, status):
+        """Show a status symbol, styled through the window stylesheet's status property"""
+        self.setText(text)
+        self.setProperty("status", status)
+        self.style().unpolish(self)
+        self.style().polish(self)
 
     def show_success(self, duration=1500):
         """Show success checkmark"""
-        self.setText("✓")
-        self.setStyleSheet("""
-            QLabel {
-                color: #00aa00;
-                font-weight: bold;
-                font-size: 14px;
-            }
-        """)
+        self.set_status("✓", "success")
         QTimer.singleShot(duration, self.clear_status)
 
     def show_failure(self, duration=1500):
         """Show failure indicator"""
-        self.setText("✗")
-        self.setStyleSheet("""
-            QLabel {
-                color: #cc0000;
-                font-weight: bold;
-                font-size: 14px;
-            }
-        """)
+        self.set_status("✗", "failure")
         QTimer.singleShot(duration, self.clear_status)
 
     def show_warning(self, duration=1500):
         """Show warning indicator"""
-        self.setText("!")
-        self.setStyleSheet("""
-            QLabel {
-                color: #ee8800;
-                font-weight: bold;
-                font-size: 14px;
-            }
-        """)
+        self.set_status("!", "warning")
         QTimer.singleShot(duration, self.clear_status)
 
     def clear_status(self):
         """Clear the status indicator"""
-        self.setText("")
-        self.setStyleSheet("""
-            QLabel {
-                font-weight: bold;
-                font-size: 14px;
-                padding: 1px;
-                margin: 1px;
-            }
-        """)
+        self.set_status("", "")
 
 
 class CodeCombinerApp(QMainWindow):
     def __init__(self):
         super().__init__()
+        self._url_cache = {}  # posix -> QUrl of listed files, for copying them as files
+        self._line_count_cache = {}  # posix -> (line_count, st_mtime_ns, st_size)
+
+        # Watches the listed files, so cached line counts only need refreshing when a file changes
+        self._fs_watcher = QFileSystemWatcher(self)
+        self._fs_watcher.fileChanged.connect(self.on_watched_file_changed)
 
         # Initialize settings
         self.settings = QSettings("CodeCombiner", "CodeCombinerApp")
-        self.file_paths = [Path(fp) for fp in self.settings.value("file_paths", [])]
+        stored_paths = self.settings.value("file_paths", []) or []
+        if isinstance(stored_paths, str):
+            stored_paths = [stored_paths]
+        self._set_file_paths([Path(fp) for fp in _filter_python_posix(stored_paths)])
         stored_dir = self.settings.value("selected_directory", "")
         self.selected_directory = Path(stored_dir) if stored_dir and Path(stored_dir).exists() else Path(
             __file__).resolve().parent
 
         # Initialize state variables
+        # Posix strings, which hash faster than Path objects; only ever holds listed files,
+        # so its size is the checked count
         self.checked_file_paths = set()
-        self.checkboxes = []
-        self.previous_versions = {}
+        self.previous_versions = {}  # Path -> deque of snapshot files, newest last
+        self._revert_dir = None  # Temporary directory holding the snapshots, created on first use
+        self._revert_ids = {}  # Path -> number used in its snapshot file names
+        self._snapshot_stat = {}  # Path -> (st_mtime_ns, st_size) of the file when last snapshotted
         self.operation_labels = {}
-        self.highlighted_checkbox = None
+        self.highlighted_file = None  # Posix string of the right-clicked file
         self.directory_tabs = {}
-        self.tab_file_checkboxes = {}
+        self._tab_signatures = {}
+        self._pending_counts = deque()
+        self._counts_scheduled = False
+
+        # File I/O runs on a single pool thread, so operations on a file happen in the order requested
+        self._io_pool = QThreadPool(self)
+        self._io_pool.setMaxThreadCount(1)
+        self._file_tasks = set()  # Tasks kept alive until they report back
+        self._settings_dirty = False
+
+        # Restarted on every edit, so the file list is written once edits pause for 500 ms
+        self._settings_flush_timer = QTimer(self)
+        self._settings_flush_timer.setSingleShot(True)
+        self._settings_flush_timer.setInterval(500)
+        self._settings_flush_timer.timeout.connect(self._flush_settings)
+        self._scan_in_flight = False
+        self._rescan_requested = False
+        self._scan_worker = None
 
         # Set up the UI
         self.init_ui()
 
+        # Measure once what the directory tab rows need besides the file name itself
+        self._row_fm = QFontMetrics(self.font())
+        self._row_extra_width = self._row_fm.horizontalAdvance(" (00000 lines)") + 40
+
+        # Right-click menu shared by every file entry
+        self._file_ctx_menu = QMenu(self)
+        self._act_copy = self._file_ctx_menu.addAction("Copy File Content")
+        self._act_remove = self._file_ctx_menu.addAction("Remove From List")
+
         # Set up keyboard shortcuts
         self.setup_shortcuts()
 
@@ -189,6 +769,50 @@ class CodeCombinerApp(QMainWindow):
         self.setMinimumSize(800, 600)  # Set minimum window size to prevent buttons from disappearing
         self.setWindowIcon(QIcon.fromTheme("accessories-text-editor"))
 
+    def _set_file_paths(self, file_paths):
+        """Replace the file list, along with its cached posix strings, names and row index"""
+        self.file_paths = file_paths
+        self._file_posix = [fp.as_posix() for fp in file_paths]
+        self._file_names = {fp.name for fp in file_paths}
+        self._path_index = {fp: i for i, fp in enumerate(file_paths)}
+        listed = set(self._file_posix)
+        if self._url_cache:
+            self._url_cache = {posix: url for posix, url in self._url_cache.items() if posix in listed}
+
+        watched = set(self._fs_watcher.files())
+        if watched - listed:
+            self._fs_watcher.removePaths(list(watched - listed))
+        if listed - watched:
+            # Counts cached while a file was unwatched (e.g. by the tab drain) may have missed edits
+            for posix in listed - watched:
+                self._line_count_cache.pop(posix, None)
+            self._fs_watcher.addPaths(list(listed - watched))
+
+    def _append_file_path(self, file_path):
+        """Append a file to the list, keeping its cached posix string, name and row index in sync; return the posix"""
+        self._path_index[file_path] = len(self.file_paths)
+        self.file_paths.append(file_path)
+        self._file_posix.append(file_path.as_posix())
+        self._file_names.add(file_path.name)
+        self._line_count_cache.pop(self._file_posix[-1], None)  # May predate the watch, see _set_file_paths
+        self._fs_watcher.addPath(self._file_posix[-1])
+        return self._file_posix[-1]
+
+    def _remove_file_path(self, file_path):
+        """Remove a file from the list, keeping the cached posix strings, names and row index in sync; return its row"""
+        index = self._path_index.pop(file_path)
+        del self.file_paths[index]
+        posix = self._file_posix.pop(index)
+        self._file_names.discard(file_path.name)
+        self._url_cache.pop(posix, None)
+        self._fs_watcher.removePath(posix)
+
+        # The list keeps its order, so only the files after the removed one shift up
+        path_index = self._path_index
+        for row in range(index, len(self.file_paths)):
+            path_index[self.file_paths[row]] = row
+        return index
+
     def setup_shortcuts(self):
         """Set up keyboard shortcuts for common operations"""
         # Copy combined code: Ctrl+Shift+C
@@ -211,6 +835,7 @@ class CodeCombinerApp(QMainWindow):
         # Main widget and layout
         self.central_widget = QWidget()
         self.setCentralWidget(self.central_widget)
+        self.setStyleSheet(_WINDOW_QSS)
         main_layout = QVBoxLayout(self.central_widget)
         main_layout.setSpacing(4)  # Reduced spacing from 8 to 4
         main_layout.setContentsMargins(8, 8, 8, 8)  # Reduced margins from 10 to 8
@@ -298,18 +923,25 @@ class CodeCombinerApp(QMainWindow):
         selected_files_layout = QVBoxLayout(selected_files_group)
         selected_files_layout.setContentsMargins(6, 12, 6, 6)  # Reduced margins
 
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_area.setMinimumHeight(120)  # Reduced from 180 to 120 to give more space to Available Files
-        self.scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOn)  # Always show vertical scrollbar
-
-        self.file_list_widget = QWidget()
-        self.file_list_layout = QVBoxLayout(self.file_list_widget)
-        self.file_list_layout.setSpacing(1)  # Reduced from 2 to 1
-        self.file_list_layout.setContentsMargins(4, 4, 4, 4)  # Reduced margins
-        self.scroll_area.setWidget(self.file_list_widget)
-
-        selected_files_layout.addWidget(self.scroll_area)
+        # Rows are painted by a delegate, so only the visible ones cost anything
+        self.file_list_view = QListView()
+        self.file_list_view.setMinimumHeight(120)  # Reduced from 180 to 120 to give more space to Available Files
+        self.file_list_view.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOn)  # Always show vertical scrollbar
+        self.file_model = SelectedFilesModel(self, self.file_list_view)
+        self.file_list_view.setModel(self.file_model)
+        self.file_list_view.setItemDelegate(SelectedFileDelegate(self, self.file_list_view))
+        self.file_list_view.setUniformItemSizes(True)
+        self.file_list_view.viewport().setAttribute(Qt.WA_Hover)  # Lets the delegate paint the hovered row
+        self.file_list_view.setLayoutMode(QListView.Batched)
+        self.file_list_view.setContextMenuPolicy(Qt.CustomContextMenu)
+        self.file_list_view.customContextMenuRequested.connect(self.show_file_list_context_menu)
+        selected_files_layout.addWidget(self.file_list_view)
+
+        self.empty_files_label = QLabel("No files selected. Add files from the tabs below or use the 'Upload' buttons.")
+        self.empty_files_label.setAlignment(Qt.AlignCenter)
+        self.empty_files_label.setObjectName("EmptyFilesLabel")
+        self.empty_files_label.hide()
+        selected_files_layout.addWidget(self.empty_files_label)
 
         # Add informational label
         info_label = QLabel("Right-click on a file for more options")
@@ -440,94 +1072,166 @@ class CodeCombinerApp(QMainWindow):
             self.status_bar.showMessage(f"Directory changed to: {chosen_dir}", 3000)
 
     def build_directory_tabs(self, all_files_grouped):
-        """Build tabs for each directory containing files"""
-        # Clear existing tabs
-        while self.filter_tabs.count() > 0:
-            tab = self.filter_tabs.widget(0)
-            self.filter_tabs.removeTab(0)
-            tab.deleteLater()
-
-        self.directory_tabs.clear()
-        self.tab_file_checkboxes.clear()
-
-        # Create tabs for each directory
-        for dir_key, files in sorted(all_files_grouped.items()):
-            tab_widget = QWidget()
-            tab_layout = QVBoxLayout(tab_widget)
-            tab_layout.setSpacing(1)  # Reduced from 2 to 1
-            tab_layout.setContentsMargins(2, 2, 2, 2)  # Reduced from 5,5,5,5 to 2,2,2,2
-
-            # Create a scroll area for file checkboxes to make them scrollable
-            files_scroll_area = QScrollArea()
-            files_scroll_area.setWidgetResizable(True)
-            files_scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOn)  # Always show vertical scrollbar
-            files_content_widget = QWidget()
-            files_content_layout = QVBoxLayout(files_content_widget)
-            files_content_layout.setSpacing(0)  # Reduced from 2 to 0 to make it more compact
-            files_content_layout.setContentsMargins(0, 0, 0, 0)
-
-            # Add file checkboxes
-            self.tab_file_checkboxes[dir_key] = []
-            for rel_path, abs_path in files:
-                hbox = QHBoxLayout()
-                hbox.setSpacing(2)  # Reduced from 4 to 2
-                hbox.setContentsMargins(1, 0, 1, 0)  # Reduced from 2,0,2,0 to 1,0,1,0
-
-                # Create checkbox with file information
-                checkbox = FileCheckBox(rel_path, abs_path, self)
-
-                # Try to get line count for display
-                try:
-                    line_count = sum(1 for _ in open(abs_path, 'r', encoding='utf-8'))
-                    rel_path_with_count = f"{rel_path} ({line_count} lines)"
-                    checkbox.setText(rel_path_with_count)
-                except:
-                    pass
-
-                hbox.addWidget(checkbox)
-                self.tab_file_checkboxes[dir_key].append((checkbox, Path(abs_path)))
-                hbox.addStretch()
-
-                file_item_widget = QWidget()
-                file_item_widget.setFixedHeight(20)  # Reduced from 24 to 20
-                file_item_widget.setLayout(hbox)
-                files_content_layout.addWidget(file_item_widget)
-
-            # Add stretch to push all items to the top
-            files_content_layout.addStretch()
-
-            # Set up scroll area
-            files_scroll_area.setWidget(files_content_widget)
-            tab_layout.addWidget(files_scroll_area, 1)  # Give it a stretch factor of 1
-
-            self.filter_tabs.addTab(tab_widget, dir_key)
-
-        # If no tabs were created, add an empty tab
-        if self.filter_tabs.count() == 0:
-            empty_tab = QWidget()
-            empty_layout = QVBoxLayout(empty_tab)
-            empty_label = QLabel("No Python files found in the selected directory")
-            empty_label.setAlignment(Qt.AlignCenter)
-            empty_label.setStyleSheet("color: #888888; font-style: italic;")
-            empty_layout.addWidget(empty_label)
-            empty_layout.addStretch()
-            self.filter_tabs.addTab(empty_tab, "No Files")
+        """Build tabs for each directory containing files, reusing tabs whose files did not change"""
+        # Suppress intermediate repaints; the tab widget paints once at the end
+        self.filter_tabs.setUpdatesEnabled(False)
+        try:
+            # Drop all tabs in one pass when none of them can be reused (empty state or new directory)
+            if self.directory_tabs.keys().isdisjoint(all_files_grouped):
+                old_tabs = [self.filter_tabs.widget(i) for i in range(self.filter_tabs.count())]
+                self.filter_tabs.clear()
+                for tab in old_tabs:
+                    tab.deleteLater()
+
+                self.directory_tabs.clear()
+                self._tab_signatures.clear()
+                self._pending_counts.clear()
+
+            # Drop tabs of directories that no longer have files
+            stale_models = set()  # Models whose queued line counts are dropped or superseded
+            for dir_key in list(self.directory_tabs):
+                if dir_key not in all_files_grouped:
+                    view = self.directory_tabs.pop(dir_key)
+                    del self._tab_signatures[dir_key]
+                    stale_models.add(view.model())
+                    self.filter_tabs.removeTab(self.filter_tabs.indexOf(view))
+                    view.deleteLater()
+
+            # Create or update tabs for each directory, keeping them sorted
+            new_counts = []
+            for tab_index, (dir_key, files) in enumerate(sorted(all_files_grouped.items())):
+                signature = hash(tuple(sorted(abs_path for _, abs_path in files)))
+                view = self.directory_tabs.get(dir_key)
+
+                if view is None:
+                    view = self.create_directory_tab_view(files)
+                    self.directory_tabs[dir_key] = view
+                    self.filter_tabs.insertTab(tab_index, view, dir_key)
+                elif self._tab_signatures[dir_key] != signature:
+                    model = view.model()
+                    stale_models.add(model)
+                    model.replace(files)
+                    view.itemDelegate().row_size = self.row_size_for(model.rels)
+                else:
+                    # Same files: keep the model and its check state, but recount in case contents changed;
+                    # _get_line_count only rereads files whose mtime or size differ
+                    stale_models.add(view.model())
+
+                # Line counts are filled in lazily
+                self._tab_signatures[dir_key] = signature
+                model = view.model()
+                new_counts.extend((model, row) for row in range(len(files)))
+
+            if stale_models:
+                self._pending_counts = deque(
+                    (model, row) for model, row in self._pending_counts if model not in stale_models
+                )
+            self._pending_counts.extend(new_counts)
+
+            # If no tabs were created, add an empty tab
+            if self.filter_tabs.count() == 0:
+                empty_label = QLabel("No Python files found in the selected directory")
+                empty_label.setAlignment(Qt.AlignHCenter | Qt.AlignTop)
+                empty_label.setObjectName("EmptyTabLabel")
+                self.filter_tabs.addTab(empty_label, "No Files")
+        finally:
+            self.filter_tabs.setUpdatesEnabled(True)
+            self.filter_tabs.update()
+
+    def create_directory_tab_view(self, files):
+        """Create the list view shown as the tab page for one directory"""
+        # The view is the tab itself and only creates rows for the visible part of the list
+        view = QListView()
+        model = FileListModel(files, view)
+        view.setModel(model)
+        view.setItemDelegate(FileItemDelegate(self.row_size_for(model.rels), view))
+        view.setUniformItemSizes(True)  # Rows share one height, so Qt skips per-row measurement
+        view.setLayoutMode(QListView.Batched)
+        view.setBatchSize(100)
+        view.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOn)  # Always show vertical scrollbar
+        view.setContextMenuPolicy(Qt.CustomContextMenu)
+        view.customContextMenuRequested.connect(self.create_tab_context_menu_function(view))
+        return view
+
+    def row_size_for(self, rel_paths):
+        """Compute the row size for a directory tab from the widest file name"""
+        max_width = max((self._row_fm.horizontalAdvance(rel_path) for rel_path in rel_paths), default=0)
+        return QSize(max_width + self._row_extra_width, 20)
+
+    def create_tab_context_menu_function(self, view):
+        """Create a function to show the context menu of a directory tab view"""
+        return lambda pos: self.show_tab_context_menu(view, pos)
+
+    def show_tab_context_menu(self, view, pos):
+        """Show the right-click menu for a file in a directory tab"""
+        index = view.indexAt(pos)
+        if not index.isValid():
+            return
+
+        file_path = Path(view.model().abs[index.row()])
+        self.exec_file_context_menu(file_path, view.viewport().mapToGlobal(pos))
+
+    def exec_file_context_menu(self, file_path, global_pos):
+        """Show the shared file menu at global_pos and run the chosen action on file_path"""
+        action = self._file_ctx_menu.exec(global_pos)
+        if action == self._act_copy:
+            self.copy_file_code(file_path)
+        elif action == self._act_remove:
+            self.remove_file(file_path)
+
+    def schedule_line_counts(self):
+        """Start filling in line counts for pending tab entries from the event loop"""
+        if self._pending_counts and not self._counts_scheduled:
+            self._counts_scheduled = True
+            QTimer.singleShot(0, self._drain_counts)
+
+    def _drain_counts(self):
+        """Count lines for a batch of tab entries on the I/O thread"""
+        batch = []
+        while self._pending_counts and len(batch) < 50:
+            model, row = self._pending_counts.popleft()
+            batch.append((model, model.abs, row))
+        if not batch:
+            self._counts_scheduled = False
+            return
+
+        paths = [abs_paths[row] for _, abs_paths, row in batch]
+        # A failed batch is skipped rather than stalling the drain for the rest of the session
+        self.run_file_task(
+            self._io_count_lines, (paths,),
+            lambda counts: self._on_tab_counts(batch, counts),
+            lambda error: self._on_tab_counts_failed(batch, error)
+        )
+
+    def _on_tab_counts(self, batch, counts):
+        """Fill in a counted batch of tab entries, then count the next one"""
+        # Entries of tabs that were rebuilt or dropped while counting are skipped
+        live_models = {view.model() for view in self.directory_tabs.values()}
+        for (model, abs_paths, row), line_count in zip(batch, counts):
+            if line_count is not None and model in live_models and model.abs is abs_paths:
+                model.set_line_count(row, line_count)
+
+        self._counts_scheduled = False
+        self.schedule_line_counts()
+
+    def _on_tab_counts_failed(self, batch, error):
+        """Report a batch of tab entries that could not be counted, then count the next one"""
+        self.status_bar.showMessage(f"Failed to count lines of {len(batch)} files: {str(error)}", 5000)
+        self._on_tab_counts(batch, [None] * len(batch))
 
     def select_all_in_tab(self, dir_key):
         """Select all files in a specific tab"""
-        if dir_key not in self.tab_file_checkboxes:
+        if dir_key not in self.directory_tabs:
             return
 
-        for (checkbox, _) in self.tab_file_checkboxes[dir_key]:
-            checkbox.setChecked(True)
+        self.directory_tabs[dir_key].model().set_all_checked(True)
 
     def deselect_all_in_tab(self, dir_key):
         """Deselect all files in a specific tab"""
-        if dir_key not in self.tab_file_checkboxes:
+        if dir_key not in self.directory_tabs:
             return
 
-        for (checkbox, _) in self.tab_file_checkboxes[dir_key]:
-            checkbox.setChecked(False)
+        self.directory_tabs[dir_key].model().set_all_checked(False)
 
     def add_selected_files_from_current_tab(self):
         """Add selected files from the current tab to the main list"""
@@ -540,55 +1244,39 @@ class CodeCombinerApp(QMainWindow):
 
     def add_selected_files_from_tab(self, dir_key):
         """Add selected files from a specific tab to the main list"""
-        if dir_key not in self.tab_file_checkboxes:
+        if dir_key not in self.directory_tabs:
             return
 
-        any_checked = False
         newly_added = []
-        existing_names = {fp.name for fp in self.file_paths}
-
-        for (checkbox, file_path) in self.tab_file_checkboxes[dir_key]:
-            if checkbox.isChecked():
-                any_checked = True
-                if file_path.name not in existing_names:
-                    self.file_paths.append(file_path)
-                    existing_names.add(file_path.name)
-                    newly_added.append(file_path)
-                    self.check_file(file_path)
-
-        if not any_checked:
+        existing_names = self._file_names  # Kept up to date by _append_file_path
+        checked_paths = self.directory_tabs[dir_key].model().checked_paths()
+
+        for file_path in checked_paths:
+            if file_path.name not in existing_names:
+                posix = self._append_file_path(file_path)
+                newly_added.append(file_path)
+                self.checked_file_paths.add(posix)
+
+        if not checked_paths:
             self.status_bar.showMessage(f"No files selected from '{dir_key}'", 3000)
             return
 
         if newly_added:
-            self.settings.setValue("file_paths", [fp.as_posix() for fp in self.file_paths])
-            self.display_filenames()
+            self._mark_settings_dirty()
+            self.display_appended_files(newly_added)
             self.status_bar.showMessage(f"Added {len(newly_added)} new files from '{dir_key}'", 3000)
         else:
             self.status_bar.showMessage(f"All selected files from '{dir_key}' were already in the list", 3000)
 
     def filter_and_scan_file_paths(self):
         """Filter the file paths and scan for new files"""
-        allowed_extensions = {'.py'}
-        excluded_filenames = {'__init__.py', 'Codehelp.py', 'analysis_depend.py'}
-
-        # Filter out invalid files
-        filtered_file_paths = [
-            fp for fp in self.file_paths
-            if fp.suffix.lower() in allowed_extensions and fp.name not in excluded_filenames
-        ]
-
-        # Remove duplicates (by filename)
-        unique_file_paths = []
-        seen_file_names = set()
-
-        for fp in filtered_file_paths:
-            if fp.name not in seen_file_names:
-                unique_file_paths.append(fp)
-                seen_file_names.add(fp.name)
-
-        self.file_paths = unique_file_paths
-        self.settings.setValue("file_paths", [fp.as_posix() for fp in self.file_paths])
+        # Filter out invalid files and duplicates (by filename) on the cached posix strings;
+        # filtering only ever drops entries, so an unchanged length means nothing was dropped
+        kept_posix = _filter_python_posix(self._file_posix)
+        if len(kept_posix) != len(self.file_paths):
+            self._set_file_paths([Path(posix) for posix in kept_posix])
+            self.checked_file_paths.intersection_update(kept_posix)
+            self._mark_settings_dirty()
 
         # Scan directory and display files
         self.scan_and_display_directory_files()
@@ -597,55 +1285,58 @@ class CodeCombinerApp(QMainWindow):
         self.display_filenames()
 
     def scan_and_display_directory_files(self):
-        """Scan the selected directory for Python files and display them in tabs"""
-        allowed_extensions = {'.py'}
-        excluded_filenames = {'__init__.py', 'Codehelp.py', 'analysis_depend.py'}
-        excluded_dirs = {'__pycache__', '.git', '.venv', 'venv', '.idea', '.vscode'}
-
+        """Scan the selected directory for Python files in the background and display them in tabs"""
         script_dir = self.selected_directory
         self.directory_label.setText(f"Directory: {script_dir.as_posix()}")
 
-        # Group files by directory
-        all_files_grouped = {}
+        # Only one scan runs at a time; a request made meanwhile rescans once it finishes
+        if self._scan_in_flight:
+            self._rescan_requested = True
+            return
 
-        for root, dirs, files in os.walk(script_dir):
-            # Skip excluded directories
-            dirs[:] = [d for d in dirs if d not in excluded_dirs]
+        self._scan_in_flight = True
+        self.status_bar.showMessage("Scanning...")
 
-            root_path = Path(root)
+        worker = ScanWorker(str(script_dir))
+        worker.signals.finished.connect(self.on_scan_finished)
+        worker.signals.failed.connect(self.on_scan_failed)
+        self._scan_worker = worker
+        QThreadPool.globalInstance().start(worker)
 
-            for file in files:
-                file_path = root_path / file
+    def on_scan_finished(self, all_files_grouped):
+        """Build the directory tabs from a finished scan"""
+        self._scan_in_flight = False
+        self._scan_worker = None
 
-                # Check if it's a Python file and not excluded
-                if file_path.suffix.lower() in allowed_extensions and file_path.name not in excluded_filenames:
-                    try:
-                        # Get relative path for display
-                        rel = file_path.relative_to(script_dir).as_posix()
-                    except ValueError:
-                        rel = file_path.as_posix()
+        # Discard the result if it was superseded while running
+        if self._rescan_requested:
+            self._rescan_requested = False
+            self.scan_and_display_directory_files()
+            return
 
-                    try:
-                        # Get directory name for tab organization
-                        dir_rel = file_path.parent.relative_to(script_dir).as_posix()
-                        if dir_rel == ".":
-                            dir_rel = "(top-level)"
-                    except ValueError:
-                        dir_rel = file_path.parent.as_posix()
+        # Build tabs from grouped files, then count lines in the background
+        self.build_directory_tabs(all_files_grouped)
+        self.schedule_line_counts()
+        self.status_bar.showMessage("Directory has been rescanned and file list updated", 3000)
 
-                    # Add to grouped files
-                    if dir_rel not in all_files_grouped:
-                        all_files_grouped[dir_rel] = []
+    def on_scan_failed(self, error):
+        """Report a scan that raised, keeping the current tabs"""
+        self._scan_in_flight = False
+        self._scan_worker = None
 
-                    all_files_grouped[dir_rel].append((rel, file_path.as_posix()))
+        # A rescan requested meanwhile may well succeed, so try it instead of reporting
+        if self._rescan_requested:
+            self._rescan_requested = False
+            self.scan_and_display_directory_files()
+            return
 
-        # Build tabs from grouped files
-        self.build_directory_tabs(all_files_grouped)
+        error_msg = f"Failed to scan directory '{self.selected_directory.as_posix()}': {str(error)}"
+        self.status_bar.showMessage(error_msg, 5000)
+        QMessageBox.critical(self, "Error", error_msg)
 
     def reload_files(self):
         """Reload files from the selected directory"""
         self.filter_and_scan_file_paths()
-        self.status_bar.showMessage("Directory has been rescanned and file list updated", 3000)
 
     def upload_files_replace(self):
         """Replace all files with newly selected files"""
@@ -660,13 +1351,10 @@ class CodeCombinerApp(QMainWindow):
                 self.status_bar.showMessage("No files were selected", 3000)
                 return
 
-            allowed_extensions = {'.py'}
-            excluded_filenames = {'__init__.py', 'Codehelp.py', 'analysis_depend.py'}
-
             # Filter and remove duplicates
             filtered_file_paths = [
                 fp for fp in new_file_paths
-                if fp.suffix.lower() in allowed_extensions and fp.name not in excluded_filenames
+                if fp.name.endswith(_ALLOWED_EXT) and fp.name not in _EXCLUDED_FILES
             ]
 
             unique_file_paths = []
@@ -678,9 +1366,9 @@ class CodeCombinerApp(QMainWindow):
                     seen_file_names.add(fp.name)
 
             # Replace files and update state
-            self.file_paths = unique_file_paths
-            self.checked_file_paths = set(unique_file_paths)
-            self.settings.setValue("file_paths", [fp.as_posix() for fp in self.file_paths])
+            self._set_file_paths(unique_file_paths)
+            self.checked_file_paths = set(self._file_posix)
+            self._mark_settings_dirty()
 
             # Update display
             self.display_filenames()
@@ -699,31 +1387,28 @@ class CodeCombinerApp(QMainWindow):
                 self.status_bar.showMessage("No files were selected", 3000)
                 return
 
-            allowed_extensions = {'.py'}
-            excluded_filenames = {'__init__.py', 'Codehelp.py', 'analysis_depend.py'}
-
             # Filter and check for existing files
             filtered_file_paths = [
                 fp for fp in new_file_paths
-                if fp.suffix.lower() in allowed_extensions and fp.name not in excluded_filenames
+                if fp.name.endswith(_ALLOWED_EXT) and fp.name not in _EXCLUDED_FILES
             ]
 
-            existing_file_names = {fp.name for fp in self.file_paths}
+            existing_file_names = self._file_names  # Kept up to date by _append_file_path
             added_files = []
             skipped_files = []
 
             for file_path in filtered_file_paths:
                 if file_path.name not in existing_file_names:
-                    self.file_paths.append(file_path)
-                    existing_file_names.add(file_path.name)
+                    posix = self._append_file_path(file_path)
                     added_files.append(file_path)
-                    self.check_file(file_path)
+                    self.checked_file_paths.add(posix)
                 else:
                     skipped_files.append(file_path)
 
             # Update state and display
-            self.settings.setValue("file_paths", [fp.as_posix() for fp in self.file_paths])
-            self.display_filenames()
+            if added_files:
+                self._mark_settings_dirty()
+                self.display_appended_files(added_files)
 
             # Show status message
             if added_files:
@@ -739,532 +1424,466 @@ class CodeCombinerApp(QMainWindow):
 
     def display_filenames(self):
         """Display the list of selected files"""
-        # Clear existing widgets
-        for i in reversed(range(self.file_list_layout.count())):
-            widget_to_remove = self.file_list_layout.itemAt(i).widget()
-            if widget_to_remove is not None:
-                self.file_list_layout.removeWidget(widget_to_remove)
-                widget_to_remove.deleteLater()
-
-        self.checkboxes = []
-        self.operation_labels = {}
-        script_dir = self.selected_directory
+        self.file_model.reload()
 
-        # Handle empty file list
-        if not self.file_paths:
-            empty_label = QLabel("No files selected. Add files from the tabs below or use the 'Upload' buttons.")
-            empty_label.setAlignment(Qt.AlignCenter)
-            empty_label.setStyleSheet("color: #888888; font-style: italic; padding: 20px;")
-            self.file_list_layout.addWidget(empty_label)
-            self.update_select_all_state()
-            return
-
-        # Add file items
-        for file_path in self.file_paths:
-            # Create container widget for file row
-            file_item_widget = QWidget()
-            file_item_widget.setFixedHeight(24)  # Reduced from 28 to 24
-            file_item_widget.setStyleSheet("""
-                QWidget {
-                    border-bottom: 1px solid #e0e0e0;
-                    background-color: transparent;
-                }
-                QWidget:hover {
-                    background-color: #f8f8f8;
-                }
-            """)
-
-            # Create layout for file row
-            hbox = QHBoxLayout(file_item_widget)
-            hbox.setSpacing(2)  # Reduced from 4 to 2
-            hbox.setContentsMargins(1, 0, 1, 0)  # Reduced vertical margins
-
-            # Get line count for display
-            try:
-                with file_path.open("r", encoding="utf-8") as file:
-                    line_count = sum(1 for _ in file)
-            except Exception:
-                line_count = "N/A"
-
-            # Create display text
-            display_text = self.relative_or_absolute(file_path, script_dir)
-            display_text_with_count = f"{display_text} ({line_count} lines)"
-
-            # Create checkbox
-            checkbox = FileCheckBox(display_text_with_count, file_path, self)
-            checkbox.setChecked(file_path in self.checked_file_paths)
-            checkbox.stateChanged.connect(self.checkbox_state_changed)
-            checkbox.rightClicked.connect(self.highlight_checkbox)
-            self.checkboxes.append((checkbox, file_path))
-            hbox.addWidget(checkbox, 1)
-
-            # Create action buttons
-            button_layout = QHBoxLayout()
-            button_layout.setSpacing(1)  # Reduced from 2 to 1
-
-            # Copy button
-            copy_button = ActionButton("Copy", tooltip=f"Copy the content of {file_path.name}")
-            copy_button.setFixedWidth(50)  # Reduced from 55 to 50
-            copy_button.clicked.connect(self.create_copy_function(file_path))
-            button_layout.addWidget(copy_button)
-
-            # Copy status label
-            copy_label = StatusLabel()
-            button_layout.addWidget(copy_label)
-
-            # Paste button
-            paste_button = ActionButton("Paste", tooltip=f"Paste clipboard content to {file_path.name}")
-            paste_button.setFixedWidth(50)  # Reduced from 55 to 50
-            paste_button.clicked.connect(self.create_paste_function(file_path))
-            button_layout.addWidget(paste_button)
-
-            # Paste status label
-            paste_label = StatusLabel()
-            button_layout.addWidget(paste_label)
-
-            # Revert button
-            revert_button = ActionButton("Revert", tooltip=f"Revert {file_path.name} to previous version")
-            revert_button.setFixedWidth(50)  # Reduced from 55 to 50
-            revert_button.clicked.connect(self.create_revert_function(file_path))
-            button_layout.addWidget(revert_button)
-
-            # Revert status label
-            revert_label = StatusLabel()
-            button_layout.addWidget(revert_label)
-
-            # Remove button
-            remove_button = ActionButton("Remove", tooltip=f"Remove {file_path.name} from the list")
-            remove_button.setFixedWidth(50)  # Reduced from 55 to 50
-            remove_button.clicked.connect(self.create_remove_function(file_path))
-            button_layout.addWidget(remove_button)
-
-            hbox.addLayout(button_layout)
-
-            # Add to layout
-            self.file_list_layout.addWidget(file_item_widget)
-
-            # Store labels for status updates
-            self.operation_labels[file_path] = {
-                'copy': copy_label,
-                'paste': paste_label,
-                'revert': revert_label
-            }
-
-        # Add stretcher at the end
-        self.file_list_layout.addStretch()
+        # Status symbols for the row buttons, reusing those of files that were already listed
+        previous_labels = self.operation_labels
+        self.operation_labels = {
+            file_path: previous_labels.get(file_path) or self.row_status_indicators(posix)
+            for file_path, posix in zip(self.file_paths, self._file_posix)
+        }
 
         # Update status
-        self.update_select_all_state()
+        self.update_file_list_state()
         if self.file_paths:
-            self.directory_label.setText(f"Directory: {script_dir.as_posix()}")
-        else:
-            self.directory_label.setText("Directory: Not Selected")
+            self.directory_label.setText(f"Directory: {self.selected_directory.as_posix()}")
+
+        # Cached counts of listed files are dropped when the watcher sees them change
+        self.refresh_line_counts(
+            [fp for fp, posix in zip(self.file_paths, self._file_posix) if posix not in self._line_count_cache]
+        )
+
+    def display_appended_files(self, file_paths):
+        """Show files just appended to the list with a single row insertion"""
+        self.file_model.append_rows(file_paths)
+        for file_path, posix in zip(file_paths, self._file_posix[len(self.file_paths) - len(file_paths):]):
+            self.operation_labels[file_path] = self.row_status_indicators(posix)
+
+        self.update_file_list_state()
+        self.directory_label.setText(f"Directory: {self.selected_directory.as_posix()}")
+        self.refresh_line_counts(file_paths)
+
+    def row_status_indicators(self, posix):
+        """Create the status symbols for the buttons of a file row"""
+        return {
+            'copy': RowStatusIndicator(self.file_model, posix, 'copy'),
+            'paste': RowStatusIndicator(self.file_model, posix, 'paste'),
+            'revert': RowStatusIndicator(self.file_model, posix, 'revert')
+        }
 
-    def checkbox_state_changed(self, state):
-        """Handle checkbox state changes"""
-        checkbox = self.sender()
-        if not isinstance(checkbox, FileCheckBox):
-            return
+    def update_file_list_state(self):
+        """Show the empty placeholder when no files are selected and refresh the select/deselect buttons"""
+        self.file_list_view.setVisible(bool(self.file_paths))
+        self.empty_files_label.setVisible(not self.file_paths)
+        self.update_select_all_state()
 
-        file_path = checkbox.file_path
+    def file_display_text(self, file_path, line_count=None, posix=None):
+        """Get the text shown for a file in the selected files list; pass posix when it is already known"""
+        # Use the last known line count; counting happens on the I/O thread
+        if line_count is None:
+            cached = self._line_count_cache.get(posix or file_path.as_posix())
+            line_count = cached[0] if cached is not None else "..."
 
-        if state == Qt.Checked:
-            self.check_file(file_path)
-        else:
-            self.uncheck_file(file_path)
+        display_text = self.relative_or_absolute(file_path, self.selected_directory)
+        return f"{display_text} ({line_count} lines)"
 
-        self.update_select_all_state()
+    def _io_count_lines(self, paths):
+        """Count lines for each path, None where unreadable; runs on the I/O thread"""
+        counts = []
+        for path in paths:
+            try:
+                counts.append(self._get_line_count(path))
+            except OSError:
+                counts.append(None)
+        return counts
+
+    def _get_line_count(self, path):
+        """Count lines in a file, reusing the cached count while its mtime and size are unchanged"""
+        key = path if isinstance(path, str) else path.as_posix()
+        st = os.stat(path)
+        cached = self._line_count_cache.get(key)
+        if cached is not None and cached[1] == st.st_mtime_ns and cached[2] == st.st_size:
+            return cached[0]
+
+        line_count = _count_lines(path)
+        self._line_count_cache[key] = (line_count, st.st_mtime_ns, st.st_size)
+        return line_count
 
     def check_file(self, file_path):
         """Mark a file as checked"""
-        self.checked_file_paths.add(file_path)
+        self.checked_file_paths.add(file_path.as_posix())
 
     def uncheck_file(self, file_path):
         """Mark a file as unchecked"""
-        self.checked_file_paths.discard(file_path)
+        self.checked_file_paths.discard(file_path.as_posix())
+
+    def selected_file_paths(self):
+        """Return the checked files, in list order"""
+        checked = self.checked_file_paths
+        return [fp for fp, posix in zip(self.file_paths, self._file_posix) if posix in checked]
+
+    def selected_file_posix(self):
+        """Return the cached posix strings of the checked files, in list order"""
+        checked = self.checked_file_paths
+        return [posix for posix in self._file_posix if posix in checked]
 
     def relative_or_absolute(self, file_path, script_dir):
         """Get a relative path if possible, otherwise absolute"""
-        try:
-            return file_path.relative_to(script_dir).as_posix()
-        except ValueError:
-            return file_path.as_posix()
-
-    def highlight_checkbox(self, clicked_checkbox):
-        """Highlight the selected checkbox"""
-        # Reset previous highlight
-        if self.highlighted_checkbox and self.highlighted_checkbox != clicked_checkbox:
-            self.highlighted_checkbox.setStyleSheet("""
-                QCheckBox {
-                    spacing: 4px;
-                    margin: 1px;
-                    padding: 1px;
-                    font-family: Arial;
-                }
-                QCheckBox::indicator {
-                    width: 14px;
-                    height: 14px;
-                    margin: 1px;
-                }
-                QCheckBox:hover {
-                    background-color: #e0f0ff;
-                    border-radius: 3px;
-                }
-            """)
-
-        # Set new highlight
-        clicked_checkbox.setStyleSheet("""
-            QCheckBox {
-                spacing: 4px;
-                margin: 1px;
-                padding: 1px;
-                font-family: Arial;
-                background-color: #d0e8ff;
-                border-radius: 3px;
-            }
-            QCheckBox::indicator {
-                width: 14px;
-                height: 14px;
-                margin: 1px;
-            }
-            QCheckBox:hover {
-                background-color: #c0e0ff;
-            }
-        """)
+        return _relative_or_absolute(file_path, script_dir)
 
-        self.highlighted_checkbox = clicked_checkbox
+    def show_file_list_context_menu(self, pos):
+        """Highlight the right-clicked file and show its context menu"""
+        index = self.file_list_view.indexAt(pos)
+        if not index.isValid():
+            return
 
-    def create_remove_function(self, file_path):
-        """Create a function to remove a specific file"""
-        return lambda: self.remove_file(file_path)
+        file_path = self.file_paths[index.row()]
+        self.highlight_file(file_path)
+        self.exec_file_context_menu(file_path, self.file_list_view.viewport().mapToGlobal(pos))
+
+    def highlight_file(self, file_path):
+        """Highlight the row of a file, clearing the previous highlight"""
+        previous, self.highlighted_file = self.highlighted_file, file_path.as_posix()
+        if previous:
+            self.file_model.refresh_file(previous)
+        self.file_model.refresh_file(self.highlighted_file)
+
+    def run_file_action(self, action, file_path):
+        """Run a row button action ('copy', 'paste', 'revert' or 'remove') on a file"""
+        handlers = {
+            'copy': self.copy_file_code,
+            'paste': self.paste_file_code,
+            'revert': self.revert_file_code,
+            'remove': self.remove_file,
+        }
+        handlers[action](file_path)
 
     def remove_file(self, file_path):
         """Remove a file from the list"""
-        if file_path in self.file_paths:
-            self.file_paths.remove(file_path)
+        if file_path in self._path_index:
+            row = self._remove_file_path(file_path)
             self.uncheck_file(file_path)
-            self.settings.setValue("file_paths", [fp.as_posix() for fp in self.file_paths])
-            self.display_filenames()
+            self.operation_labels.pop(file_path, None)
+            self.file_model.remove_row(row)
+            self.update_file_list_state()
+            self._mark_settings_dirty()
             self.status_bar.showMessage(f"Removed {file_path.name} from the list", 3000)
 
-    def create_copy_function(self, file_path):
-        """Create a function to copy a specific file's content"""
-        return lambda: self.copy_file_code(file_path)
-
-    def create_paste_function(self, file_path):
-        """Create a function to paste to a specific file"""
-        return lambda: self.paste_file_code(file_path)
-
-    def create_revert_function(self, file_path):
-        """Create a function to revert a specific file"""
-        return lambda: self.revert_file_code(file_path)
-
     def copy_file_code(self, file_path):
         """Copy a file's content to clipboard"""
-        try:
-            with file_path.open("r", encoding="utf-8") as file:
-                file_code = file.readlines()
+        relative_path = self.relative_or_absolute(file_path, self.selected_directory)
+        file_identifier = f"# {relative_path}"
+
+        self.run_file_task(
+            self._io_copy_file, (file_path, file_identifier),
+            lambda result: self._on_file_copied(file_path, result),
+            lambda error: self._on_file_copy_failed(file_path, error)
+        )
+
+    def _io_copy_file(self, file_path, file_identifier):
+        """Read a file with its identifier for the clipboard and snapshot it; runs on the I/O thread"""
+        content = file_path.read_text(encoding="utf-8")
+
+        # Format content with file identifier
+        if not content or _first_line(content) != file_identifier:
+            clipboard_content = f"{file_identifier}\n{content}"
+        else:
+            clipboard_content = content
 
-            script_dir = self.selected_directory
+        # Save current version for potential revert
+        return clipboard_content, self.save_current_version(file_path)
 
-            try:
-                relative_path = file_path.relative_to(script_dir).as_posix()
-            except ValueError:
-                relative_path = file_path.as_posix()
+    def _on_file_copied(self, file_path, result):
+        """Put a read file on the clipboard"""
+        clipboard_content, snapshot_error = result
 
-            file_identifier = f"# {relative_path}"
+        # Copy to clipboard
+        QApplication.clipboard().setText(clipboard_content)
+        self.report_snapshot_error(file_path, snapshot_error)
 
-            # Format content with file identifier
-            if file_code:
-                first_line = file_code[0].strip()
-                if first_line != file_identifier:
-                    clipboard_content = f"{file_identifier}\n" + "".join(file_code)
-                else:
-                    clipboard_content = "".join(file_code)
-            else:
-                clipboard_content = f"{file_identifier}\n"
+        # Update status
+        label = self.operation_labels.get(file_path, {}).get('copy')
+        if label is not None:
+            label.show_success()
 
-            # Copy to clipboard
-            QApplication.clipboard().setText(clipboard_content)
+        self.status_bar.showMessage(f"Copied {file_path.name} to clipboard", 3000)
 
-            # Save current version for potential revert
-            self.save_current_version(file_path)
+    def _on_file_copy_failed(self, file_path, error):
+        """Report a file that could not be read for copying"""
+        if isinstance(error, UnicodeDecodeError):
+            error_msg = f"Failed to copy file '{file_path.name}': Not a valid text file"
+        else:
+            error_msg = f"Failed to copy file '{file_path.name}': {str(error)}"
+        self.status_bar.showMessage(error_msg, 5000)
 
-            # Update status
-            if file_path in self.operation_labels and 'copy' in self.operation_labels[file_path]:
-                label = self.operation_labels[file_path]['copy']
-                label.show_success()
+        label = self.operation_labels.get(file_path, {}).get('copy')
+        if label is not None:
+            label.show_failure()
 
-            self.status_bar.showMessage(f"Copied {file_path.name} to clipboard", 3000)
+        QMessageBox.critical(self, "Error", error_msg)
 
-        except UnicodeDecodeError:
-            error_msg = f"Failed to copy file '{file_path.name}': Not a valid text file"
-            self.status_bar.showMessage(error_msg, 5000)
+    def paste_file_code(self, file_path):
+        """Paste clipboard content to a file"""
+        clipboard_text = QApplication.clipboard().text()
 
-            if file_path in self.operation_labels and 'copy' in self.operation_labels[file_path]:
-                label = self.operation_labels[file_path]['copy']
-                label.show_failure()
+        if not clipboard_text or not clipboard_text.splitlines():
+            warning_msg = "Clipboard is empty. Please copy some text first."
+            self.status_bar.showMessage(warning_msg, 3000)
 
-            QMessageBox.critical(self, "Error", error_msg)
+            label = self.operation_labels.get(file_path, {}).get('paste')
+            if label is not None:
+                label.show_warning()
 
-        except Exception as e:
-            error_msg = f"Failed to copy file '{file_path.name}': {str(e)}"
-            self.status_bar.showMessage(error_msg, 5000)
+            QMessageBox.warning(self, "Warning", warning_msg)
+            return
 
-            if file_path in self.operation_labels and 'copy' in self.operation_labels[file_path]:
-                label = self.operation_labels[file_path]['copy']
-                label.show_failure()
+        # Determine the correct identifier for the file
+        relative_path = self.relative_or_absolute(file_path, self.selected_directory)
+        expected_first_line = f"# {relative_path}"
 
-            QMessageBox.critical(self, "Error", error_msg)
+        self.run_file_task(
+            self._io_paste_file, (file_path, clipboard_text, expected_first_line),
+            lambda snapshot_error: self._on_file_pasted(file_path, snapshot_error),
+            lambda error: self._on_file_paste_failed(file_path, error)
+        )
 
-    def paste_file_code(self, file_path):
-        """Paste clipboard content to a file"""
-        clipboard_text = QApplication.clipboard().text()
+    def _io_paste_file(self, file_path, clipboard_text, expected_first_line):
+        """Write pasted text to a file under its identifier after snapshotting it; runs on the I/O thread"""
+        lines = clipboard_text.splitlines()
+        first_line = lines[0].strip()
 
-        if clipboard_text:
+        # Format content with correct identifier
+        if first_line == expected_first_line:
+            content_to_write = clipboard_text
+        else:
+            # Only the existing file's first line matters, so read just its head
             try:
-                lines = clipboard_text.splitlines()
-
-                if not lines:
-                    warning_msg = "Clipboard is empty. Please copy some text first."
-                    self.status_bar.showMessage(warning_msg, 3000)
-
-                    if file_path in self.operation_labels and 'paste' in self.operation_labels[file_path]:
-                        label = self.operation_labels[file_path]['paste']
-                        label.show_warning()
+                with file_path.open("rb") as f:
+                    head = f.read(4096)
+            except FileNotFoundError:
+                head = b""
+            existing_first_line = head.split(b"\n", 1)[0].decode("utf-8", errors="replace").strip()
+
+            if existing_first_line == expected_first_line:
+                remaining_content = "\n".join(lines)
+                content_to_write = f"{existing_first_line}\n{remaining_content}"
+            else:
+                content_to_write = f"{expected_first_line}\n{clipboard_text}"
 
-                    QMessageBox.warning(self, "Warning", warning_msg)
-                    return
+        # Save current version for potential revert
+        snapshot_error = self.save_current_version(file_path)
 
-                # Determine the correct identifier for the file
-                script_dir = self.selected_directory
-                try:
-                    relative_path = file_path.relative_to(script_dir).as_posix()
-                except ValueError:
-                    relative_path = file_path.as_posix()
+        # Write content to file
+        file_path.write_text(content_to_write, encoding="utf-8")
+        self._line_count_cache.pop(file_path.as_posix(), None)
+        return snapshot_error
 
-                expected_first_line = f"# {relative_path}"
-                first_line = lines[0].strip()
+    def _on_file_pasted(self, file_path, snapshot_error):
+        """Report a successful paste"""
+        self.report_snapshot_error(file_path, snapshot_error)
 
-                # Format content with correct identifier
-                if first_line == expected_first_line:
-                    content_to_write = clipboard_text
-                else:
-                    if file_path.exists():
-                        existing_lines = file_path.read_text(encoding="utf-8").splitlines()
-                        if existing_lines:
-                            existing_first_line = existing_lines[0].strip()
-                            if existing_first_line == expected_first_line:
-                                remaining_content = "\n".join(lines)
-                                content_to_write = f"{existing_first_line}\n{remaining_content}"
-                            else:
-                                content_to_write = f"{expected_first_line}\n{clipboard_text}"
-                        else:
-                            content_to_write = f"{expected_first_line}\n{clipboard_text}"
-                    else:
-                        content_to_write = f"{expected_first_line}\n{clipboard_text}"
-
-                # Save current version for potential revert
-                self.save_current_version(file_path)
-
-                # Write content to file
-                file_path.write_text(content_to_write, encoding="utf-8")
-
-                # Update status
-                if file_path in self.operation_labels and 'paste' in self.operation_labels[file_path]:
-                    label = self.operation_labels[file_path]['paste']
-                    label.show_success()
-
-                self.update_line_count(file_path)
-                self.status_bar.showMessage(f"Pasted content to {file_path.name}", 3000)
-
-            except Exception as e:
-                error_msg = f"Failed to paste into file '{file_path.name}': {str(e)}"
-                self.status_bar.showMessage(error_msg, 5000)
+        # Update status
+        label = self.operation_labels.get(file_path, {}).get('paste')
+        if label is not None:
+            label.show_success()
 
-                if file_path in self.operation_labels and 'paste' in self.operation_labels[file_path]:
-                    label = self.operation_labels[file_path]['paste']
-                    label.show_failure()
+        self.update_line_count(file_path)
+        self.status_bar.showMessage(f"Pasted content to {file_path.name}", 3000)
 
-                QMessageBox.critical(self, "Error", error_msg)
-        else:
-            warning_msg = "Clipboard is empty. Please copy some text first."
-            self.status_bar.showMessage(warning_msg, 3000)
+    def _on_file_paste_failed(self, file_path, error):
+        """Report a paste that could not be written"""
+        error_msg = f"Failed to paste into file '{file_path.name}': {str(error)}"
+        self.status_bar.showMessage(error_msg, 5000)
 
-            if file_path in self.operation_labels and 'paste' in self.operation_labels[file_path]:
-                label = self.operation_labels[file_path]['paste']
-                label.show_warning()
+        label = self.operation_labels.get(file_path, {}).get('paste')
+        if label is not None:
+            label.show_failure()
 
-            QMessageBox.warning(self, "Warning", warning_msg)
+        QMessageBox.critical(self, "Error", error_msg)
 
     def save_current_version(self, file_path):
-        """Save the current version of a file for potential revert"""
+        """Save the current version of a file for potential revert; runs on the I/O thread and returns any error"""
+        # Keep up to 5 snapshots per file on disk instead of holding file contents in memory
+        history = self.previous_versions.setdefault(file_path, deque(maxlen=5))  # Increased from 3 to 5
+
         try:
-            current_content = file_path.read_text(encoding="utf-8")
-        except Exception as e:
-            error_msg = f"Failed to read file '{file_path.name}': {str(e)}"
-            self.status_bar.showMessage(error_msg, 5000)
-            QMessageBox.critical(self, "Error", error_msg)
-            return
+            # Nothing to save if the file is unchanged since its newest snapshot
+            st = file_path.stat()
+            file_stat = (st.st_mtime_ns, st.st_size)
+            if history and self._snapshot_stat.get(file_path) == file_stat:
+                return None
+
+            if self._revert_dir is None:
+                self._revert_dir = Path(tempfile.mkdtemp(prefix="codecombiner_revert_"))
+
+            # Reuse the oldest snapshot's file once the history is full, otherwise take a free slot
+            if len(history) == history.maxlen:
+                snapshot = history.popleft()
+            else:
+                file_id = self._revert_ids.setdefault(file_path, len(self._revert_ids))
+                snapshot = next(
+                    path for path in (self._revert_dir / f"{file_id}_{slot}" for slot in range(history.maxlen))
+                    if path not in history
+                )
 
-        # Initialize or update version history
-        if file_path not in self.previous_versions:
-            self.previous_versions[file_path] = []
+            shutil.copyfile(file_path, snapshot)
+        except Exception as e:
+            return e
 
-        self.previous_versions[file_path].append(current_content)
+        history.append(snapshot)
+        self._snapshot_stat[file_path] = file_stat
+        return None
 
-        # Limit history size
-        if len(self.previous_versions[file_path]) > 5:  # Increased from 3 to 5
-            self.previous_versions[file_path].pop(0)
+    def report_snapshot_error(self, file_path, error):
+        """Report a failure to save a file's current version, if there was one"""
+        if error is not None:
+            error_msg = f"Failed to read file '{file_path.name}': {str(error)}"
+            self.status_bar.showMessage(error_msg, 5000)
+            QMessageBox.critical(self, "Error", error_msg)
 
     def revert_file_code(self, file_path):
         """Revert a file to its previous version"""
-        if file_path in self.previous_versions and self.previous_versions[file_path]:
-            try:
-                previous_code = self.previous_versions[file_path].pop()
-                file_path.write_text(previous_code, encoding="utf-8")
-
-                # Update status
-                if file_path in self.operation_labels and 'revert' in self.operation_labels[file_path]:
-                    label = self.operation_labels[file_path]['revert']
-                    label.show_success()
-
-                self.update_line_count(file_path)
-                self.status_bar.showMessage(f"Reverted {file_path.name} to previous version", 3000)
-
-            except Exception as e:
-                error_msg = f"Failed to revert file '{file_path.name}': {str(e)}"
-                self.status_bar.showMessage(error_msg, 5000)
-
-                if file_path in self.operation_labels and 'revert' in self.operation_labels[file_path]:
-                    label = self.operation_labels[file_path]['revert']
-                    label.show_failure()
+        self.run_file_task(
+            self._io_revert_file, (file_path,),
+            lambda reverted: self._on_file_reverted(file_path, reverted),
+            lambda error: self._on_file_revert_failed(file_path, error)
+        )
+
+    def _io_revert_file(self, file_path):
+        """Restore a file's newest snapshot, returning False if it has none; runs on the I/O thread"""
+        history = self.previous_versions.get(file_path)
+        if not history:
+            return False
+
+        snapshot = history.pop()
+        self._snapshot_stat.pop(file_path, None)
+        shutil.copyfile(snapshot, file_path)
+        self._line_count_cache.pop(file_path.as_posix(), None)
+        return True
+
+    def _on_file_reverted(self, file_path, reverted):
+        """Report a revert, or that there was nothing to revert to"""
+        if reverted:
+            # Update status
+            label = self.operation_labels.get(file_path, {}).get('revert')
+            if label is not None:
+                label.show_success()
 
-                QMessageBox.critical(self, "Error", error_msg)
+            self.update_line_count(file_path)
+            self.status_bar.showMessage(f"Reverted {file_path.name} to previous version", 3000)
         else:
             warning_msg = f"No previous versions available for file '{file_path.name}'"
             self.status_bar.showMessage(warning_msg, 3000)
 
-            if file_path in self.operation_labels and 'revert' in self.operation_labels[file_path]:
-                label = self.operation_labels[file_path]['revert']
+            label = self.operation_labels.get(file_path, {}).get('revert')
+            if label is not None:
                 label.show_warning()
 
             QMessageBox.warning(self, "Warning", warning_msg)
 
+    def _on_file_revert_failed(self, file_path, error):
+        """Report a revert that could not be written"""
+        error_msg = f"Failed to revert file '{file_path.name}': {str(error)}"
+        self.status_bar.showMessage(error_msg, 5000)
+
+        label = self.operation_labels.get(file_path, {}).get('revert')
+        if label is not None:
+            label.show_failure()
+
+        QMessageBox.critical(self, "Error", error_msg)
+
     def update_select_all_state(self):
         """Update the state of select/deselect all buttons"""
-        if not self.checkboxes:
+        if not self.file_paths:
             self.select_all_button.setEnabled(False)
             self.unselect_all_button.setEnabled(False)
             return
 
-        all_checked = all(cb.isChecked() for cb, _ in self.checkboxes)
-        any_checked = any(cb.isChecked() for cb, _ in self.checkboxes)
+        checked_count = len(self.checked_file_paths)
 
-        self.select_all_button.setEnabled(not all_checked)
-        self.unselect_all_button.setEnabled(any_checked)
+        self.select_all_button.setEnabled(checked_count < len(self.file_paths))
+        self.unselect_all_button.setEnabled(checked_count > 0)
 
     def select_all_files(self):
         """Select all files in the list"""
-        for checkbox, fp in self.checkboxes:
-            checkbox.setChecked(True)
-            self.check_file(fp)
+        self.checked_file_paths.update(self._file_posix)
+        self.file_model.refresh_rows()
 
         self.update_select_all_state()
         self.status_bar.showMessage("Selected all files", 3000)
 
     def unselect_all_files(self):
         """Unselect all files in the list"""
-        for checkbox, fp in self.checkboxes:
-            checkbox.setChecked(False)
-            self.uncheck_file(fp)
+        self.checked_file_paths.clear()
+        self.file_model.refresh_rows()
 
         self.update_select_all_state()
         self.status_bar.showMessage("Deselected all files", 3000)
 
     def move_checked_files_to_head(self):
         """Move checked files to the top of the list"""
-        checked_files = [fp for cb, fp in self.checkboxes if cb.isChecked()]
-        unchecked_files = [fp for cb, fp in self.checkboxes if not cb.isChecked()]
+        checked = self.checked_file_paths
+        checked_rows = [row for row, posix in enumerate(self._file_posix) if posix in checked]
 
-        if not checked_files:
+        if not checked_rows:
             self.status_bar.showMessage("No files selected to move", 3000)
             return
 
-        self.file_paths = checked_files + unchecked_files
-        self.settings.setValue("file_paths", [fp.as_posix() for fp in self.file_paths])
-        self.display_filenames()
+        checked_files = [self.file_paths[row] for row in checked_rows]
+        unchecked_files = [fp for fp, posix in zip(self.file_paths, self._file_posix) if posix not in checked]
+
+        self._set_file_paths(checked_files + unchecked_files)
+        self.file_model.move_rows_to_head(checked_rows)
+        self._mark_settings_dirty()
 
         self.status_bar.showMessage(f"Moved {len(checked_files)} selected files to the top", 3000)
 
-    def combine_code(self):
-        """Combine code from selected files"""
-        combined_code = ""
+    def combine_code(self, file_paths, contents):
+        """Combine the code of files read by _io_read_files, reporting files that could not be read"""
+        parts = []
         script_dir = self.selected_directory
-        selected_files = [fp for cb, fp in self.checkboxes if cb.isChecked()]
-
-        if not selected_files:
-            return ""
 
-        for file_path in selected_files:
-            if not file_path.exists():
+        for file_path, content in zip(file_paths, contents):
+            if isinstance(content, FileNotFoundError):
                 warning_msg = f"The file '{file_path.name}' was not found. Please re-upload."
                 self.status_bar.showMessage(warning_msg, 5000)
                 QMessageBox.warning(self, "File Not Found", warning_msg)
-                continue
-
-            try:
-                with file_path.open("r", encoding="utf-8") as file:
-                    lines = file.readlines()
-
-                # Get relative path for file identifier
-                try:
-                    relative_dir = file_path.parent.relative_to(script_dir).as_posix()
-                except ValueError:
-                    relative_dir = file_path.parent.as_posix()
-
-                file_name = file_path.name
-
-                # Create file identifier
-                if relative_dir in ('', '.', '(top-level)'):
-                    file_identifier = f"# {file_name}"
-                else:
-                    file_identifier = f"# {relative_dir}/{file_name}"
-
-                # Add file identifier if not already present
-                if lines:
-                    first_line = lines[0].strip()
-                    if first_line != file_identifier.strip():
-                        lines.insert(0, f"{file_identifier}\n")
-                else:
-                    lines.insert(0, f"{file_identifier}\n")
 
-                # Add file content to combined code
-                file_content = ''.join(lines)
-                combined_code += file_content + "\n\n"
-
-            except UnicodeDecodeError:
+            elif isinstance(content, UnicodeDecodeError):
                 warning_msg = f"Skipped binary file '{file_path.name}'. Cannot decode as text."
                 self.status_bar.showMessage(warning_msg, 5000)
                 QMessageBox.warning(self, "Warning", warning_msg)
 
-            except Exception as e:
-                error_msg = f"Failed to read file '{file_path.name}': {str(e)}"
+            elif isinstance(content, Exception):
+                error_msg = f"Failed to read file '{file_path.name}': {str(content)}"
                 self.status_bar.showMessage(error_msg, 5000)
                 QMessageBox.critical(self, "Error", error_msg)
 
-        return combined_code
+            else:
+                # Create file identifier from the path relative to the directory
+                file_identifier = f"# {self.relative_or_absolute(file_path, script_dir)}"
+
+                # Add file identifier if not already present
+                if not content or _first_line(content) != file_identifier:
+                    parts.append(f"{file_identifier}\n")
+
+                # Add file content to combined code
+                parts.append(content)
+                parts.append("\n\n")
+
+        return "".join(parts)
 
     def copy_combined_code(self):
         """Combine selected files' code and copy to clipboard"""
-        combined_code = self.combine_code()
+        selected_files = self.selected_file_paths()
+        if not selected_files:
+            self._on_combined_files_read(selected_files, [])
+            return
+
+        self.run_file_task(
+            _read_files, (selected_files,),
+            lambda contents: self._on_combined_files_read(selected_files, contents)
+        )
+
+    def _on_combined_files_read(self, selected_files, contents):
+        """Copy the combined code of the read files to the clipboard"""
+        combined_code = self.combine_code(selected_files, contents)
 
         if combined_code.strip():
             QApplication.clipboard().setText(combined_code)
             self.copy_combined_label.show_success()
 
             # Count files and lines
-            selected_files = [fp for cb, fp in self.checkboxes if cb.isChecked()]
             line_count = combined_code.count('\n')
 
             self.status_bar.showMessage(
@@ -1279,7 +1898,7 @@ class CodeCombinerApp(QMainWindow):
 
     def copy_all_file_paths(self):
         """Copy selected file paths to clipboard"""
-        selected_file_paths = [fp for cb, fp in self.checkboxes if cb.isChecked()]
+        selected_file_paths = self.selected_file_paths()
 
         if not selected_file_paths:
             warning_msg = "No files selected to copy paths"
@@ -1288,15 +1907,7 @@ class CodeCombinerApp(QMainWindow):
             return
 
         script_dir = self.selected_directory
-        relative_file_info = []
-
-        for file_path in selected_file_paths:
-            try:
-                relative_path = file_path.relative_to(script_dir).as_posix()
-            except ValueError:
-                relative_path = file_path.as_posix()
-
-            relative_file_info.append(relative_path)
+        relative_file_info = [self.relative_or_absolute(fp, script_dir) for fp in selected_file_paths]
 
         all_paths_str = "\n".join(relative_file_info)
         QApplication.clipboard().setText(all_paths_str)
@@ -1305,43 +1916,111 @@ class CodeCombinerApp(QMainWindow):
 
     def copy_selected_files(self):
         """Copy selected files to clipboard (as files)"""
-        selected_file_paths = [fp for cb, fp in self.checkboxes if cb.isChecked()]
+        selected_posix = self.selected_file_posix()
 
-        if not selected_file_paths:
+        if not selected_posix:
             warning_msg = "No files selected to copy"
             self.status_bar.showMessage(warning_msg, 3000)
             QMessageBox.warning(self, "Warning", warning_msg)
             return
 
-        # Create mime data with file URLs
+        # Create mime data with file URLs, built once per listed file
+        url_cache = self._url_cache
+        urls = []
+        for posix in selected_posix:
+            url = url_cache.get(posix)
+            if url is None:
+                url = url_cache[posix] = QUrl.fromLocalFile(posix)
+            urls.append(url)
+
         mime_data = QMimeData()
-        urls = [QUrl.fromLocalFile(fp.as_posix()) for fp in selected_file_paths]
         mime_data.setUrls(urls)
         QApplication.clipboard().setMimeData(mime_data)
 
         self.copy_file_label.show_success()
-        self.status_bar.showMessage(f"Copied {len(selected_file_paths)} files to clipboard", 3000)
+        self.status_bar.showMessage(f"Copied {len(selected_posix)} files to clipboard", 3000)
+
+    def _mark_settings_dirty(self):
+        """Schedule the file list to be saved once the current burst of edits is over"""
+        self._settings_dirty = True
+        self._settings_flush_timer.start()
+
+    def _flush_settings(self):
+        """Write the file list to settings if it changed since the last write"""
+        if not self._settings_dirty:
+            return
+
+        self._settings_dirty = False
+        self.settings.setValue("file_paths", self._file_posix)
 
     def closeEvent(self, event):
         """Handle application close event"""
         # Save file paths
-        self.settings.setValue("file_paths", [fp.as_posix() for fp in self.file_paths])
+        self._settings_flush_timer.stop()
+        self._flush_settings()
+
+        # Let queued file operations finish, then drop the revert snapshots
+        self._io_pool.waitForDone()
+        if self._revert_dir is not None:
+            shutil.rmtree(self._revert_dir, ignore_errors=True)
         event.accept()
 
     def update_line_count(self, file_path):
-        """Update line count in file checkbox label"""
-        for checkbox, fp in self.checkboxes:
-            if fp == file_path:
-                try:
-                    with file_path.open("r", encoding="utf-8") as file:
-                        line_count = sum(1 for _ in file)
-                except Exception:
-                    line_count = "N/A"
-
-                display_text = self.relative_or_absolute(file_path, self.selected_directory)
-                display_text_with_count = f"{display_text} ({line_count} lines)"
-                checkbox.setText(display_text_with_count)
-                break
+        """Update line count in the file's row"""
+        self.refresh_line_counts([file_path])
+
+    def on_watched_file_changed(self, path):
+        """Recount the lines of a listed file that changed on disk"""
+        self._line_count_cache.pop(path, None)
+
+        # A change may be reported after the file was removed from the list
+        file_path = Path(path)
+        if file_path not in self._path_index:
+            return
+
+        # Editors that save by replacing the file make the watcher drop it;
+        # addPath is a no-op returning False for a path that is still watched
+        if os.path.exists(path):
+            self._fs_watcher.addPath(path)
+
+        self.update_line_count(file_path)
+
+    def refresh_line_counts(self, file_paths):
+        """Recount lines of selected files on the I/O thread and update their rows"""
+        if file_paths:
+            file_paths = list(file_paths)
+            self.run_file_task(
+                self._io_count_lines, (file_paths,), lambda counts: self._on_selected_counts(file_paths, counts)
+            )
+
+    def _on_selected_counts(self, file_paths, counts):
+        """Show counted lines in the rows of files that are still listed"""
+        for file_path, line_count in zip(file_paths, counts):
+            row = self._path_index.get(file_path)
+            if row is None:
+                continue
+            text = self.file_display_text(file_path, "N/A" if line_count is None else line_count)
+            if text != self.file_model.texts[row]:
+                self.file_model.set_text(row, text)
+
+    def run_file_task(self, fn, args, on_finished, on_failed=None):
+        """Run fn(*args) on the I/O thread, then pass its result or exception to a callback on the GUI thread"""
+        task = FileTask(fn, args, on_finished, on_failed)
+        task.signals.finished.connect(self._on_file_task_finished)
+        task.signals.failed.connect(self._on_file_task_failed)
+        self._file_tasks.add(task)
+        self._io_pool.start(task)
+
+    def _on_file_task_finished(self, task, result):
+        """Hand a finished task's result to its callback"""
+        self._file_tasks.discard(task)
+        task.on_finished(result)
+
+    def _on_file_task_failed(self, task, error):
+        """Hand a failed task's exception to its callback"""
+        self._file_tasks.discard(task)
+        if task.on_failed is not None:
+            task.on_failed(error)
 
 
 if __name__ == "__main__":